@@ -1,6 +1,9 @@
+import io
+
 import streamlit as st
 import pandas as pd
 import numpy as np
+from python_calamine import CalamineWorkbook
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 
 # =====================================================
@@ -14,6 +17,69 @@ st.set_page_config(
 st.title("📊 Board Excel Intelligence Platform")
 st.caption("Universal Excel spreadsheet viewer with executive insights and Board-ready presentation")
 
+# =====================================================
+# CACHED LOADERS (KEYED ON FILE CONTENT + SHEET)
+# =====================================================
+# calamine (Rust) parses XLSX far faster than openpyxl; openpyxl stays as
+# the fallback for workbooks calamine cannot read.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _list_sheets(file_bytes: bytes) -> list[str]:
+    try:
+        return CalamineWorkbook.from_filelike(io.BytesIO(file_bytes)).sheet_names
+    except Exception:
+        return pd.ExcelFile(io.BytesIO(file_bytes), engine="openpyxl").sheet_names
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_sheet(file_bytes: bytes, sheet: str) -> pd.DataFrame:
+    try:
+        return pd.read_excel(
+            io.BytesIO(file_bytes), sheet_name=sheet, header=0, engine="calamine"
+        )
+    except Exception:
+        return pd.read_excel(
+            io.BytesIO(file_bytes), sheet_name=sheet, header=0, engine="openpyxl"
+        )
+
+
+def _sample_is_numeric(series: pd.Series, sample_size: int = 32) -> bool:
+    sample = series.dropna().head(sample_size)
+    return bool(pd.to_numeric(sample, errors="coerce").notna().any())
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _numeric_columns(file_bytes: bytes, sheet: str) -> list:
+    # Typed columns are classified from one dtypes pass; only object
+    # columns fall back to coercing a sample
+    sheet_df = _load_sheet(file_bytes, sheet)
+    is_typed = sheet_df.dtypes.map(pd.api.types.is_numeric_dtype).to_numpy(dtype=bool)
+    is_numeric = np.zeros(len(sheet_df.columns), dtype=bool)
+    is_numeric[is_typed] = sheet_df.loc[:, is_typed].notna().any().to_numpy()
+
+    for i in np.flatnonzero(~is_typed):
+        is_numeric[i] = _sample_is_numeric(sheet_df.iloc[:, i])
+
+    return sheet_df.columns[is_numeric].tolist()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _sheet_metrics(file_bytes: bytes, sheet: str) -> tuple[float, float]:
+    sheet_df = _load_sheet(file_bytes, sheet)
+    numeric_df = sheet_df[_numeric_columns(file_bytes, sheet)].apply(
+        pd.to_numeric, errors="coerce"
+    )
+
+    if numeric_df.empty:
+        return 0.0, 0.0
+
+    numeric_values = numeric_df.to_numpy(dtype=np.float64)
+    return float(np.nansum(numeric_values)), float(np.nanmax(numeric_values))
+
+
+# Rows serialised to the grid by default; the full sheet stays server-side
+# for the executive metrics.
+PREVIEW_ROWS = 1000
+
 # =====================================================
 # SIDEBAR – FILE NAVIGATION
 # =====================================================
@@ -32,9 +98,9 @@ if not uploaded_files:
 file_names = [f.name for f in uploaded_files]
 selected_file_name = st.sidebar.selectbox("Select file", file_names)
 selected_file = next(f for f in uploaded_files if f.name == selected_file_name)
+file_bytes = selected_file.getvalue()
 
-xls = pd.ExcelFile(selected_file)
-sheet_name = st.sidebar.selectbox("Select sheet", xls.sheet_names)
+sheet_name = st.sidebar.selectbox("Select sheet", _list_sheets(file_bytes))
 
 # =====================================================
 # VIEW MODE
@@ -44,6 +110,16 @@ view_mode = st.sidebar.radio(
     ["Interactive Spreadsheet", "Executive View"]
 )
 
+full_render = st.sidebar.checkbox(
+    "Full render (all rows, no paging/virtualisation, for print export)",
+    value=False
+)
+
+show_all_rows = st.sidebar.checkbox(
+    f"Show all rows (grid previews the first {PREVIEW_ROWS:,})",
+    value=False
+)
+
 # =====================================================
 # HIGHLIGHTING CONTROLS (SIDEBAR ONLY)
 # =====================================================
@@ -62,24 +138,16 @@ highlight_color = st.sidebar.color_picker(
 # =====================================================
 # LOAD EXCEL (SAFE)
 # =====================================================
-raw_df = pd.read_excel(
-    selected_file,
-    sheet_name=sheet_name,
-    header=0
-)
-
-df = raw_df.copy()
-df = df.replace({np.nan: ""})
+# st.cache_data hands back a fresh copy, so df can be modified in place.
+# NaN/NaT serialise as null, which the grid already renders as empty.
+df = _load_sheet(file_bytes, sheet_name)
 
 # =====================================================
 # COLUMN ANALYSIS (AFTER df EXISTS)
 # =====================================================
 all_columns = df.columns.tolist()
 
-numeric_columns = [
-    col for col in df.columns
-    if pd.to_numeric(df[col], errors="coerce").notna().sum() > 0
-]
+numeric_columns = frozenset(_numeric_columns(file_bytes, sheet_name))
 
 default_text_columns = [df.columns[0]] if len(df.columns) > 0 else []
 
@@ -90,15 +158,21 @@ highlight_columns = st.sidebar.multiselect(
 
 # ✅ APPLY BOARD PRESET *AFTER* df EXISTS (FIXED)
 if preset_highlight:
-    highlight_columns = [
-        col for col in df.columns
-        if any(k in col.lower() for k in ["cost", "budget", "total", "sum"])
-    ]
+    highlight_columns = df.columns[
+        df.columns.astype(str).str.contains("cost|budget|total|sum", case=False)
+    ].tolist()
+
+# Only the preview rows reach either view, so row highlighting is capped
+# to them; full render always sends every row.
+if show_all_rows or full_render:
+    preview_len = len(df)
+else:
+    preview_len = min(len(df), PREVIEW_ROWS)
 
 highlight_row = st.sidebar.number_input(
     "Highlight row (1-based, optional)",
     min_value=0,
-    max_value=len(df),
+    max_value=preview_len,
     step=1
 )
 
@@ -113,20 +187,24 @@ for col in df.columns:
 
     style = {
         "textAlign": align,
-        "whiteSpace": "normal",
         "lineHeight": "1.4",
         "borderRight": "1px solid #3a3a3a",
         "borderBottom": "1px solid #2a2a2a",
     }
 
+    # ag-grid always renders autoHeight columns to measure them, which
+    # defeats column virtualisation; wrap rows only in full render.
+    if full_render:
+        style["whiteSpace"] = "normal"
+
     if col in highlight_columns:
         style["backgroundColor"] = highlight_color
         style["fontWeight"] = "600"
 
     gb.configure_column(
         col,
-        wrapText=True,
-        autoHeight=True,
+        wrapText=full_render,
+        autoHeight=full_render,
         cellStyle=style
     )
 
@@ -156,26 +234,41 @@ if highlight_row > 0 and highlight_row <= len(df):
 # =====================================================
 # GRID OPTIONS
 # =====================================================
+# Paging + column virtualisation (fixed-height rows) keep the DOM
+# proportional to the viewport; full render restores the wrapped,
+# every-cell layout for print-style export.
+if not full_render:
+    gb.configure_pagination(paginationAutoPageSize=True)
+
 gb.configure_grid_options(
-    suppressColumnVirtualisation=True,
+    suppressColumnVirtualisation=full_render,
     alwaysShowHorizontalScroll=True,
     domLayout="normal"
 )
 
 grid_options = gb.build()
 
+if preview_len == len(df):
+    display_df = df
+else:
+    display_df = df.head(preview_len)
+
 # =====================================================
 # INTERACTIVE VIEW
 # =====================================================
 if view_mode == "Interactive Spreadsheet":
     st.subheader(f"📄 Spreadsheet View – {sheet_name}")
 
+    if display_df is not df:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(df):,} rows")
+
     AgGrid(
-        df,
+        display_df,
         gridOptions=grid_options,
         height=540,
         update_mode=GridUpdateMode.NO_UPDATE,
         fit_columns_on_grid_load=False,
+        enable_enterprise_modules=False,
         theme="streamlit"
     )
 
@@ -185,12 +278,7 @@ if view_mode == "Interactive Spreadsheet":
 else:
     st.subheader(f"📊 Executive View – {sheet_name}")
 
-    numeric_df = df[numeric_columns].apply(
-        pd.to_numeric, errors="coerce"
-    )
-
-    total_sum = numeric_df.sum().sum() if not numeric_df.empty else 0
-    max_value = numeric_df.max().max() if not numeric_df.empty else 0
+    total_sum, max_value = _sheet_metrics(file_bytes, sheet_name)
 
     col1, col2 = st.columns(2)
     col1.metric("Total Numeric Sum", f"{round(total_sum, 2)}")
@@ -198,11 +286,50 @@ else:
 
     st.markdown("---")
 
-    AgGrid(
-        df,
-        gridOptions=grid_options,
-        height=540,
-        update_mode=GridUpdateMode.NO_UPDATE,
-        fit_columns_on_grid_load=False,
-        theme="streamlit"
+    if display_df is not df:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(df):,} rows")
+
+    # Read-only view: st.dataframe ships Arrow instead of the grid's JSON.
+    # A column_config format makes Streamlit ignore the Styler's display
+    # values, so numbers look the same with or without a highlight.
+    exec_df = display_df.drop(columns="_row_flag", errors="ignore")
+    exec_config = {
+        col: st.column_config.NumberColumn(format="plain")
+        for col in exec_df.select_dtypes(include=np.number).columns
+    }
+    flagged_row = highlight_row - 1
+    wants_highlight = bool(highlight_columns) or flagged_row in exec_df.index
+
+    # Streamlit refuses Stylers above pandas' render limit, so large
+    # previews are shown unstyled rather than crashing the view
+    styler_limit = pd.get_option("styler.render.max_elements")
+    if wants_highlight and exec_df.size > styler_limit:
+        st.caption(
+            f"Highlights are not shown above {styler_limit:,} cells; "
+            "use the Interactive Spreadsheet to see them."
+        )
+        wants_highlight = False
+
+    if wants_highlight:
+        exec_view = exec_df.style.format(na_rep="")
+
+        if highlight_columns:
+            exec_view = exec_view.set_properties(
+                subset=highlight_columns,
+                **{"background-color": highlight_color, "font-weight": "600"}
+            )
+
+        if flagged_row in exec_df.index:
+            exec_view = exec_view.set_properties(
+                subset=pd.IndexSlice[[flagged_row], :],
+                **{"background-color": "#E3F2FD", "font-weight": "600"}
+            )
+    else:
+        exec_view = exec_df
+
+    st.dataframe(
+        exec_view,
+        column_config=exec_config,
+        use_container_width=True,
+        height=520
     )